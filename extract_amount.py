@@ -1,147 +1,286 @@
 import re
 from decimal import Decimal
+from functools import lru_cache
+from operator import itemgetter
+import string
 import sys
 from word2number import w2n
 
 sys.stdout.reconfigure(encoding='utf-8')
 
+# -----------------------------
+# Suffix -> (multiplier, unit), keyed on the lowercased suffix
+# with trailing '.'/'s' removed
+# -----------------------------
+_LAKH = (100000, 'lakh')
+_CRORE = (10000000, 'crore')
+_THOUSAND = (1000, 'thousand')
+_MILLION = (1000000, 'million')
+_BILLION = (1000000000, 'billion')
+_SUFFIX_MAP = {
+    'lakh': _LAKH, 'lac': _LAKH, 'l': _LAKH, 'lk': _LAKH,
+    'crore': _CRORE, 'cr': _CRORE,
+    'k': _THOUSAND, 'thousand': _THOUSAND, 'thou': _THOUSAND,
+    'million': _MILLION, 'm': _MILLION, 'mn': _MILLION,
+    'billion': _BILLION, 'bn': _BILLION, 'b': _BILLION,
+}
+
+_CLEAN_NUM_RE = re.compile(r'\d+(?:\.\d+)?')
+_NON_NUMERIC_RE = re.compile(r'[^\d\.]')
+
 # -----------------------------
 # Function to convert numbers with suffixes
+# (pure and returns immutable values, so results are cached)
+# Returns (base_num, base_scale, mult, unit); amount = base_num * mult / base_scale,
+# or None when num_str is not a single number (e.g. the date '12.05.2024')
 # -----------------------------
+@lru_cache(maxsize=4096)
 def parse_amount_string(num_str, multiplier_str):
     num_clean = num_str.replace(',', '').replace(' ', '').strip()
-    try:
-        base = Decimal(num_clean)
-    except Exception:
+    # scaled integer: '2.50' -> base_num 250, base_scale 100
+    if _CLEAN_NUM_RE.fullmatch(num_clean):
+        int_part, _, frac = num_clean.partition('.')
+    else:
         # fallback if string contains non-numeric characters
-        base = Decimal(re.sub(r'[^\d\.]', '', num_clean) or '0')
-    mult = Decimal(1)
+        num_clean = _NON_NUMERIC_RE.sub('', num_clean)
+        if num_clean.count('.') > 1:
+            return None
+        int_part, _, frac = num_clean.partition('.')
+    base_num = int(int_part + frac or '0')
+    base_scale = 10 ** len(frac)
+    mult = 1
     unit = None
     if not multiplier_str:
-        return base, mult, unit
-    m = multiplier_str.lower().strip()
-    if re.search(r'\b(lakh|lac|lacs|lakh?s)\b', m) or m in ['l','lk']:
-        mult = Decimal(100000); unit = 'lakh'
-    elif re.search(r'\b(crore|cr|cr\.|crore?s)\b', m):
-        mult = Decimal(10000000); unit = 'crore'
-    elif re.search(r'\b(k|thousand|k\.|thou)\b', m):
-        mult = Decimal(1000); unit = 'thousand'
-    elif re.search(r'\b(million|m|mn|m\.|millions)\b', m):
-        mult = Decimal(1000000); unit = 'million'
-    elif re.search(r'\b(billion|bn|b)\b', m):
-        mult = Decimal(1000000000); unit = 'billion'
-    else:
-        if m.endswith('k'):
-            mult = Decimal(1000); unit = 'thousand'
-        elif m.endswith('m'):
-            mult = Decimal(1000000); unit = 'million'
-        elif m.endswith('l'):
-            mult = Decimal(100000); unit = 'lakh'
-    return base, mult, unit
+        return base_num, base_scale, mult, unit
+    key = multiplier_str.lower().strip().rstrip('.').rstrip('s').rstrip('.')
+    hit = _SUFFIX_MAP.get(key)
+    if hit is None and key[-1:] in ('k', 'm', 'l'):
+        # fall back on the last letter for unlisted spellings
+        hit = _SUFFIX_MAP[key[-1]]
+    if hit is not None:
+        mult, unit = hit
+    return base_num, base_scale, mult, unit
+
+def format_scaled(base_num, base_scale):
+    # inverse of the scaling above: (250, 100) -> '2.50'
+    if base_scale == 1:
+        return str(base_num)
+    places = len(str(base_scale)) - 1
+    digits = str(base_num).rjust(places + 1, '0')
+    return digits[:-places] + '.' + digits[-places:]
 
 # -----------------------------
 # Function to convert words to numbers
 # -----------------------------
+_WORDS = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
+    'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14, 'fifteen': 15,
+    'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50,
+    'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+    'hundred': 100, 'thousand': 1000, 'million': 1000000, 'billion': 1000000000,
+    'lakh': 100000, 'lakhs': 100000, 'lac': 100000, 'lacs': 100000,
+    'crore': 10000000, 'crores': 10000000,
+}
+# scale words w2n does not know; phrases using them never go to w2n
+_INDIAN_SCALES = {'lakh', 'lakhs', 'lac', 'lacs', 'crore', 'crores'}
+
+def _fast_word_to_num(phrase):
+    # well-formed phrases only ('two hundred fifty thousand',
+    # 'one crore twenty lakh'); anything else returns None
+    tokens = phrase.lower().split()
+    if tokens == ['zero']:
+        return 0
+    total = 0
+    current = 0
+    last = None       # kind of the previous token
+    scale = None      # last thousand/lakh/million/crore/billion seen
+    for tok in tokens:
+        val = _WORDS.get(tok)
+        if not val:
+            return None
+        if val < 10:
+            if last not in (None, 'tens', 'hundred', 'scale'):
+                return None
+            current += val
+            last = 'unit'
+        elif val < 100:
+            if last not in (None, 'hundred', 'scale'):
+                return None
+            current += val
+            last = 'tens' if val >= 20 else 'teen'
+        elif val == 100:
+            if last != 'unit' or current >= 10:
+                return None
+            current *= 100
+            last = 'hundred'
+        else:
+            if not current or (scale is not None and val >= scale):
+                return None
+            total += current * val
+            current = 0
+            scale = val
+            last = 'scale'
+    return total + current
+
 def word_to_number(text):
+    num = _fast_word_to_num(text)
+    if num is not None:
+        return num
+    if _INDIAN_SCALES.intersection(text.lower().split()):
+        # w2n would silently drop the lakh/crore and misread the amount
+        return None
     try:
         return Decimal(w2n.word_to_num(text.lower()))
     except:
         return None
 
+# -----------------------------
+# Number words: w2n's vocabulary plus lakh/crore
+# (longer words first, so 'sixteen' is not tried as 'six' and retried)
+# -----------------------------
+_NUM_WORDS = (
+    'eleven|twelve|thirteen|fourteen|fifteen|sixteen|seventeen|eighteen|nineteen|'
+    'twenty|thirty|forty|fifty|sixty|seventy|eighty|ninety|'
+    'zero|one|two|three|four|five|six|seven|eight|nine|ten|'
+    'hundred|thousand|lakhs|lakh|lacs|lac|million|crores|crore|billion|point'
+)
+
 # -----------------------------
 # Regex for numeric amounts with optional suffix and currency
 # -----------------------------
-pattern = re.compile(r"""
-(?P<prefix_currency>₹|rs\.?|inr|usd|\$)?      # optional prefix currency
-\s*
-(?P<number>\d[\d,\.]*\d|\d+)                 # number allowing commas/periods inside
-\s*
-(?P<suffix>(?:crore|cr\.?|cr|lakh|lac|lacs|l|k|k\.|thousand|million|m|mn|bn|b)s?\.?)?  # optional suffix
-|
-(?P<prefix_currency2>₹|rs\.?|inr|usd|\$)\s*(?P<number2>\d[\d,\.]*\d|\d+)
-""", re.IGNORECASE | re.VERBOSE)
+_NUMERIC_BRANCH = (
+    r"(?P<prefix_currency>₹|rs\.?|inr|usd|\$)?"      # optional prefix currency
+    r"\s*"
+    r"(?P<number>\d[\d,\.]*\d|\d+)"                 # number allowing commas/periods inside
+    r"\s*"
+    r"(?P<suffix>(?:crore|cr\.?|lakh|lac|lacs|l|k|thousand|million|m|mn|bn|b)s?\.?)?"  # optional suffix
+)
+
+# -----------------------------
+# Regex for numbers in words: 1 to _MAX_WORDS number words, so it cannot
+# swallow digits or currency prefixes meant for the numeric branch
+# -----------------------------
+_MAX_WORDS = 12
+_WORD_BRANCH = (
+    r"\b(?P<words>(?:" + _NUM_WORDS + r")(?:\s+(?:" + _NUM_WORDS + r")){0,%d})" % (_MAX_WORDS - 1) +
+    r"\b(?:\s*(?P<word_suffix>(?:lakh|lac|crore|cr|million|m)s?\b\.?))?"
+)
 
 # -----------------------------
-# Regex for numbers in words
+# Both kinds of amount in a single pass over the text
 # -----------------------------
-word_pattern = re.compile(r'\b((?:\w+\s?)+)\s*(lakh|lac|lacs|crore|cr|million|m)?\b', re.IGNORECASE)
+pattern = re.compile(r"(?i)(?:" + _NUMERIC_BRANCH + r")|(?:" + _WORD_BRANCH + r")")
+
+# -----------------------------
+# Currency prefix -> code, keyed on the lowercased prefix without '.'
+# -----------------------------
+_CUR_MAP = {'$': 'USD', 'usd': 'USD', '₹': 'INR', 'rs': 'INR', 'inr': 'INR'}
+_CUR_TRANS = str.maketrans(string.ascii_uppercase, string.ascii_lowercase, '.')
 
 # -----------------------------
 # Keywords indicating transaction amounts
 # -----------------------------
-transaction_keywords = r'\b(limit|transaction|amount|transfer|allow|approve|upto|increase|set limit|requesting)\b'
+_TXN_RE = re.compile(r'(?i)\b(limit|transaction|amount|transfer|allow|approve|upto|increase|set limit|requesting)\b')
 
 # -----------------------------
-# Main extraction function
+# Cheap pre-check: any digit or number word at all
 # -----------------------------
-def extract_amounts(text):
-    results = []
+_NUMWORD_RE = re.compile(r'(?i)\d|\b(?:' + _NUM_WORDS + r')\b')
 
-    # Check if transaction-related keywords exist
-    if not re.search(transaction_keywords, text, re.IGNORECASE):
-        return results  # skip if no keywords, prevents account/CIF numbers
-
-    # 1️⃣ Extract numeric amounts
-    for m in pattern.finditer(text):
-        currency = None
-        num_str = None
-        suffix = None
-        if m.group('number'):
-            num_str = m.group('number')
-            suffix = m.group('suffix') or ''
-            currency = m.group('prefix_currency') or ''
-        else:
-            num_str = m.group('number2') or ''
-            currency = m.group('prefix_currency2') or ''
-            suffix = ''
+# -----------------------------
+# Record builder: (kind, record) for one match, kind 0 for numeric and
+# 1 for word amounts; None means skip the match
+# -----------------------------
+def _build_record(m):
+    words = m.group('words')
+
+    # 1️⃣ Numeric amounts
+    if words is None:
+        num_str = m.group('number')
+        suffix = m.group('suffix') or ''
+        currency = m.group('prefix_currency') or ''
         cur = None
         if currency:
-            c = currency.lower().replace('.', '').strip()
-            if c in ('$', 'usd'):
-                cur = 'USD'
-            elif c in ('₹','rs','inr'):
-                cur = 'INR'
-            else:
-                cur = currency.strip()
-        base, mult, unit = parse_amount_string(num_str, suffix)
+            cur = _CUR_MAP.get(currency.translate(_CUR_TRANS).strip(), currency.strip())
+        parsed = parse_amount_string(num_str, suffix)
+        if parsed is None:
+            return None
+        base_num, base_scale, mult, unit = parsed
         # ignore extremely long numbers (likely CIF/account numbers)
-        if base > 100000000:
-            continue
-        normalized = int((base * mult).to_integral_value(rounding='ROUND_HALF_UP'))
+        if base_num > 100000000 * base_scale:
+            return None
+        # integer ROUND_HALF_UP
+        normalized = (base_num * mult + base_scale // 2) // base_scale
         start, end = m.span()
-        results.append({
-            'text': text[start:end],
+        return 0, {
+            'text': m.group(0),
             'start': start,
             'end': end,
             'currency': cur or 'unknown',
             'value': normalized,
-            'unit_multiplier': unit or (str(int(mult)) if mult!=1 else '1'),
-            'raw_number': str(base),
+            'unit_multiplier': unit or str(mult),
+            'raw_number': format_scaled(base_num, base_scale),
             'suffix': suffix or None
-        })
-
-    # 2️⃣ Extract amounts written in words
-    for wm in word_pattern.finditer(text):
-        words = wm.group(1)
-        suffix = wm.group(2) or ''
-        num = word_to_number(words)
-        if num is None:
-            continue
-        base, mult, unit = parse_amount_string(str(num), suffix)
-        normalized = int((base * mult).to_integral_value(rounding='ROUND_HALF_UP'))
-        start, end = wm.span()
-        results.append({
-            'text': text[start:end],
-            'start': start,
-            'end': end,
-            'currency': 'INR',
-            'value': normalized,
-            'unit_multiplier': unit or (str(int(mult)) if mult!=1 else '1'),
-            'raw_number': str(base),
-            'suffix': suffix or None
-        })
+        }
+
+    # 2️⃣ Amounts written in words
+    suffix = m.group('word_suffix') or ''
+    if not suffix:
+        # report a trailing scale word ('two lakh') as the suffix, as the
+        # numeric branch does, unless the words before it hold a scale too
+        head, sep, last = words.rpartition(' ')
+        if (sep and _WORDS.get(last.lower(), 0) >= 1000
+                and all(_WORDS.get(tok, 0) < 1000 for tok in head.lower().split())):
+            words, suffix = head, last
+    num = word_to_number(words)
+    if num is None:
+        return None
+    base_num, base_scale, mult, unit = parse_amount_string(str(num), suffix)
+    normalized = (base_num * mult + base_scale // 2) // base_scale
+    start, end = m.span()
+    return 1, {
+        'text': m.group(0),
+        'start': start,
+        'end': end,
+        'currency': 'INR',
+        'value': normalized,
+        'unit_multiplier': unit or str(mult),
+        'raw_number': format_scaled(base_num, base_scale),
+        'suffix': suffix or None
+    }
 
-    return results
+# -----------------------------
+# Main extraction function
+# -----------------------------
+def _extract_amounts_impl(text):
+    # Check if transaction-related keywords exist
+    if not _TXN_RE.search(text):
+        return []  # skip if no keywords, prevents account/CIF numbers
+
+    # Nothing for either pattern to convert
+    if not _NUMWORD_RE.search(text):
+        return []
+
+    finditer = pattern.finditer
+    build = _build_record
+    records = [rec for rec in map(build, finditer(text)) if rec is not None]
+    # numeric amounts first, as callers have always seen them (sort is stable)
+    records.sort(key=itemgetter(0))
+    return [record for _, record in records]
+
+# -----------------------------
+# Cached entry point: repeated texts (boilerplate headers/footers)
+# skip the regex walk. Results are cached as tuples and handed out
+# as fresh dicts so callers cannot mutate the cache.
+# -----------------------------
+@lru_cache(maxsize=1024)
+def _extract_amounts_cached(text):
+    return tuple(tuple(r.items()) for r in _extract_amounts_impl(text))
+
+def extract_amounts(text):
+    return [dict(r) for r in _extract_amounts_cached(text)]
 
 # -----------------------------
 # Test emails